@@ -5,6 +5,7 @@ import plotly.express as px
 from datetime import datetime, date
 import random
 import os
+import logging
 
 # BankSight - Complete Streamlit Application
 
@@ -34,9 +35,16 @@ div[data-testid="metric-container"] {
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH  = os.path.join(BASE_DIR, "database", "banksight.db")
 
+logger = logging.getLogger(__name__)
+
 def get_conn():
     conn = sqlite3.connect(DB_PATH, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    # WAL lets page reads run alongside CRUD writes; mmap avoids read() syscalls
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA temp_store=MEMORY")
     return conn
 
 def run_query(sql, params=None):
@@ -56,6 +64,23 @@ def run_query(sql, params=None):
         st.error(f"Query Error: {e}")
         return pd.DataFrame()
 
+def fetch_one(sql, params=None):
+    try:
+        conn = get_conn()
+        sql = sql.replace("%s", "?")
+        cursor = conn.cursor()
+        if params:
+            cursor.execute(sql, params)
+        else:
+            cursor.execute(sql)
+        row = cursor.fetchone()
+        cols = [d[0] for d in cursor.description]
+        conn.close()
+        return dict(zip(cols, row)) if row is not None else None
+    except Exception as e:
+        st.error(f"Query Error: {e}")
+        return None
+
 def run_action(sql, params=None):
     try:
         conn = get_conn()
@@ -74,13 +99,121 @@ def run_action(sql, params=None):
 
 def safe_val(sql, default=0):
     try:
-        df = run_query(sql)
-        if df.empty or df.iloc[0, 0] is None:
+        row = fetch_one(sql)
+        if row is None:
             return default
-        return df.iloc[0, 0]
+        val = next(iter(row.values()))
+        return default if val is None else val
     except:
         return default
 
+# MATERIALIZED AGGREGATES
+# Page 6 reads these small agg_* tables instead of grouping the full source
+# tables. Row-level triggers rebuild only the group(s) touched by a write.
+
+AGE_BUCKET = "CASE WHEN {age} >= 18 THEN MIN(5, ({age} - 16) / 10) ELSE 5 END"
+
+CUST_ACC = "customers c JOIN accounts a ON c.customer_id = a.customer_id"
+
+AGG_TABLES = {
+    "agg_customers_by_city": {
+        "col":    "city",
+        "key":    "c.city",
+        "aggs":   "COUNT(c.customer_id) AS total_customers, AVG(a.account_balance) AS avg_balance",
+        "source": CUST_ACC,
+    },
+    "agg_customers_by_type": {
+        "col":    "account_type",
+        "key":    "c.account_type",
+        "aggs":   "COUNT(c.customer_id) AS total_customers, SUM(a.account_balance) AS total_balance, "
+                  "AVG(a.account_balance) AS avg_balance",
+        "source": CUST_ACC,
+    },
+    "agg_customers_by_age": {
+        "col":    "age_group",
+        "key":    AGE_BUCKET.format(age="age"),
+        "aggs":   "COUNT(*) AS total_customers",
+        "source": "customers",
+    },
+    "agg_txn_by_type": {
+        "col":    "txn_type",
+        "key":    "txn_type",
+        "aggs":   "COUNT(*) AS total_transactions, "
+                  "COUNT(*) FILTER (WHERE LOWER(status) = 'success') AS success_count, "
+                  "SUM(amount) AS total_volume",
+        "source": "transactions",
+    },
+    "agg_loans_by_type": {
+        "col":    "loan_type",
+        "key":    "loan_type",
+        "aggs":   "COUNT(*) AS total_loans, AVG(loan_amount) AS avg_loan_amount, "
+                  "AVG(interest_rate) AS avg_interest_rate",
+        "source": "loans",
+    },
+}
+
+# (source table, agg table, group affected by the trigger's {row})
+AGG_TRIGGERS = [
+    ("customers",    "agg_customers_by_city", "{row}.city"),
+    ("customers",    "agg_customers_by_type", "{row}.account_type"),
+    ("customers",    "agg_customers_by_age",  AGE_BUCKET.format(age="{row}.age")),
+    ("accounts",     "agg_customers_by_city", "(SELECT city FROM customers WHERE customer_id = {row}.customer_id)"),
+    ("accounts",     "agg_customers_by_type", "(SELECT account_type FROM customers WHERE customer_id = {row}.customer_id)"),
+    ("transactions", "agg_txn_by_type",       "{row}.txn_type"),
+    ("loans",        "agg_loans_by_type",     "{row}.loan_type"),
+]
+
+def agg_select(agg, where=""):
+    spec = AGG_TABLES[agg]
+    return (f"SELECT {spec['key']} AS {spec['col']}, {spec['aggs']} "
+            f"FROM {spec['source']} {where} GROUP BY {spec['key']}")
+
+def agg_refresh(agg, group):
+    col = AGG_TABLES[agg]["col"]
+    key = AGG_TABLES[agg]["key"]
+    return (f"DELETE FROM {agg} WHERE {col} IS {group};\n"
+            f"INSERT INTO {agg} {agg_select(agg, f'WHERE {key} IS {group}')};\n")
+
+def agg_trigger_names():
+    return [f"trg_{table}_{event}_agg"
+            for table in dict.fromkeys(src for src, _, _ in AGG_TRIGGERS)
+            for event in ("insert", "delete", "update")]
+
+def init_db():
+    # Runs on every script run: one sqlite_master lookup when all is in place.
+    # Reloading with load_database.py drops the source tables and with them
+    # the triggers, so missing triggers mean the agg_* tables are stale too.
+    conn = None
+    try:
+        conn = get_conn()
+        present = {r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")}
+        if present.issuperset([*AGG_TABLES, *agg_trigger_names()]):
+            return True
+        script = "BEGIN IMMEDIATE;\n"
+        for agg in AGG_TABLES:
+            script += f"DROP TABLE IF EXISTS {agg};\nCREATE TABLE {agg} AS {agg_select(agg)};\n"
+        for table in dict.fromkeys(src for src, _, _ in AGG_TRIGGERS):
+            for event, rows in (("INSERT", ["NEW"]), ("DELETE", ["OLD"]), ("UPDATE", ["OLD", "NEW"])):
+                body = "".join(agg_refresh(agg, group.format(row=row))
+                               for src, agg, group in AGG_TRIGGERS if src == table
+                               for row in rows)
+                name = f"trg_{table}_{event.lower()}_agg"
+                script += (f"DROP TRIGGER IF EXISTS {name};\n"
+                           f"CREATE TRIGGER {name} AFTER {event} ON {table} BEGIN\n{body}END;\n")
+        conn.executescript(script + "COMMIT;\n")
+        return True
+    except Exception as e:
+        # Closing without COMMIT rolls back a partial build; the next run retries
+        logger.exception("Building the agg_* tables failed")
+        st.error(f"❌ Database Error: {e}")
+        return False
+    finally:
+        if conn is not None:
+            conn.close()
+
+init_db()
+
 # SIDEBAR
 
 st.sidebar.markdown("## 🏦 BankSight")
@@ -414,19 +547,19 @@ elif page == "✏️ CRUD Operations":
             chosen = st.selectbox("🔍 Select Customer ID to Update", options)
             if chosen != "-- Select Customer --":
                 cid = chosen.split(" — ")[0]
-                df = run_query("SELECT * FROM customers WHERE customer_id=%s", (cid,))
-                if not df.empty:
+                row = fetch_one("SELECT name,gender,age,city,account_type FROM customers WHERE customer_id=%s", (cid,))
+                if row:
                     c1, c2 = st.columns(2)
                     with c1:
-                        new_name   = st.text_input("Name", df['name'][0])
-                        new_city   = st.text_input("City", df['city'][0])
-                        new_age    = st.number_input("Age", 18, 100, int(df['age'][0]))
+                        new_name   = st.text_input("Name", row['name'])
+                        new_city   = st.text_input("City", row['city'])
+                        new_age    = st.number_input("Age", 18, 100, int(row['age']))
                     with c2:
                         g_list     = ["M", "F"]
-                        g_idx      = g_list.index(df['gender'][0]) if df['gender'][0] in g_list else 0
+                        g_idx      = g_list.index(row['gender']) if row['gender'] in g_list else 0
                         new_gender = st.selectbox("Gender", g_list, index=g_idx)
                         t_list     = ["Savings", "Current"]
-                        t_idx      = t_list.index(df['account_type'][0]) if df['account_type'][0] in t_list else 0
+                        t_idx      = t_list.index(row['account_type']) if row['account_type'] in t_list else 0
                         new_type   = st.selectbox("Account Type", t_list, index=t_idx)
                     if st.button("✅ Update", type="primary"):
                         ok = run_action(
@@ -485,10 +618,10 @@ elif page == "✏️ CRUD Operations":
             chosen = st.selectbox("🔍 Select Account to Update", opts, key="acc_update")
             if chosen != "-- Select Account --":
                 cid = chosen.split(" — ")[0]
-                df = run_query("SELECT * FROM accounts WHERE customer_id=%s", (cid,))
-                if not df.empty:
-                    st.info(f"Current Balance: ₹{float(df['account_balance'][0]):,.2f}")
-                    new_bal = st.number_input("New Balance (₹)", 1000.0, 10000000.0, float(df['account_balance'][0]))
+                row = fetch_one("SELECT account_balance FROM accounts WHERE customer_id=%s", (cid,))
+                if row:
+                    st.info(f"Current Balance: ₹{float(row['account_balance']):,.2f}")
+                    new_bal = st.number_input("New Balance (₹)", 1000.0, 10000000.0, float(row['account_balance']))
                     if st.button("✅ Update Balance", type="primary"):
                         ok = run_action("UPDATE accounts SET account_balance=%s, last_updated=%s WHERE customer_id=%s",
                                         (new_bal, datetime.now(), cid))
@@ -915,12 +1048,12 @@ elif page == "💰 Credit / Debit Simulation":
         st.subheader("🔍 Step 1: Check Account")
         cid = st.text_input("Enter Customer ID (e.g. C0001)")
         if st.button("🔍 Fetch Account", type="primary"):
-            df = run_query(
+            row = fetch_one(
                 "SELECT c.customer_id, c.name, c.city, c.account_type, a.account_balance FROM customers c JOIN accounts a ON c.customer_id = a.customer_id WHERE c.customer_id = %s",
                 (cid,)
             )
-            if not df.empty:
-                st.session_state['sim_customer'] = df.iloc[0].to_dict()
+            if row:
+                st.session_state['sim_customer'] = row
             else:
                 st.error("❌ Customer not found!")
                 if 'sim_customer' in st.session_state:
@@ -1003,31 +1136,29 @@ elif page == "🧠 Analytical Insights":
     st.markdown("Select a category, then choose a query. Results execute live from SQLite.")
     st.markdown("---")
 
+    AGE_GROUP_LABELS = ["18-25", "26-35", "36-45", "46-55", "56-65", "65+"]
+
     CATEGORIES = {
         "1️⃣  Customer & Account Analysis": {
             "Q1 — Customers per city & avg balance": {
                 "desc": "How many customers exist per city, and what is their average account balance?",
                 "sql":  """
-                    SELECT c.city,
-                           COUNT(c.customer_id)            AS total_customers,
-                           ROUND(AVG(a.account_balance),2) AS avg_balance
-                    FROM customers c
-                    JOIN accounts  a ON c.customer_id = a.customer_id
-                    GROUP BY c.city
-                    ORDER BY total_customers DESC
+                    SELECT city,
+                           total_customers,
+                           ROUND(avg_balance,2) AS avg_balance
+                    FROM agg_customers_by_city
+                    ORDER BY total_customers DESC, city
                     LIMIT 15
                 """,
             },
             "Q2 — Account type with highest total balance": {
                 "desc": "Which account type (Savings/Current) holds the highest total balance?",
                 "sql":  """
-                    SELECT c.account_type,
-                           COUNT(c.customer_id)            AS total_customers,
-                           ROUND(SUM(a.account_balance),2) AS total_balance,
-                           ROUND(AVG(a.account_balance),2) AS avg_balance
-                    FROM customers c
-                    JOIN accounts  a ON c.customer_id = a.customer_id
-                    GROUP BY c.account_type
+                    SELECT account_type,
+                           total_customers,
+                           ROUND(total_balance,2) AS total_balance,
+                           ROUND(avg_balance,2)   AS avg_balance
+                    FROM agg_customers_by_type
                     ORDER BY total_balance DESC
                 """,
             },
@@ -1064,9 +1195,8 @@ elif page == "🧠 Analytical Insights":
                 "desc": "What is the total transaction volume (sum of ₹ amounts) by transaction type?",
                 "sql":  """
                     SELECT txn_type                 AS transaction_type,
-                           ROUND(SUM(amount), 2)   AS total_transaction_volume
-                    FROM transactions
-                    GROUP BY txn_type
+                           ROUND(total_volume, 2)  AS total_transaction_volume
+                    FROM agg_txn_by_type
                     ORDER BY total_transaction_volume DESC
                 """,
             },
@@ -1085,9 +1215,10 @@ elif page == "🧠 Analytical Insights":
                 "desc": "What is the total number of transactions per transaction type?",
                 "sql":  """
                     SELECT txn_type    AS transaction_type,
-                           COUNT(*)   AS total_transactions
-                    FROM transactions
-                    GROUP BY txn_type
+                           total_transactions,
+                           success_count,
+                           ROUND(100.0 * success_count / total_transactions, 2) AS success_rate_pct
+                    FROM agg_txn_by_type
                     ORDER BY total_transactions DESC
                 """,
             },
@@ -1112,11 +1243,10 @@ elif page == "🧠 Analytical Insights":
                 "desc": "What is the average loan amount and interest rate by loan type?",
                 "sql":  """
                     SELECT loan_type,
-                           COUNT(*)                    AS total_loans,
-                           ROUND(AVG(loan_amount),2)   AS avg_loan_amount,
-                           ROUND(AVG(interest_rate),2) AS avg_interest_rate
-                    FROM loans
-                    GROUP BY loan_type
+                           total_loans,
+                           ROUND(avg_loan_amount,2)   AS avg_loan_amount,
+                           ROUND(avg_interest_rate,2) AS avg_interest_rate
+                    FROM agg_loans_by_type
                     ORDER BY avg_loan_amount DESC
                 """,
             },
@@ -1168,19 +1298,13 @@ elif page == "🧠 Analytical Insights":
             "Q13 — Customer count by age group": {
                 "desc": "How many customers exist in each age group?",
                 "sql":  """
-                    SELECT CASE
-                               WHEN age BETWEEN 18 AND 25 THEN '18-25'
-                               WHEN age BETWEEN 26 AND 35 THEN '26-35'
-                               WHEN age BETWEEN 36 AND 45 THEN '36-45'
-                               WHEN age BETWEEN 46 AND 55 THEN '46-55'
-                               WHEN age BETWEEN 56 AND 65 THEN '56-65'
-                               ELSE '65+'
-                           END        AS age_group,
-                           COUNT(*) AS total_customers
-                    FROM customers
-                    GROUP BY age_group
+                    SELECT age_group,
+                           total_customers
+                    FROM agg_customers_by_age
                     ORDER BY age_group
                 """,
+                # integer bucket -> label, so SQLite groups on a small int
+                "post": lambda df: df.assign(age_group=df["age_group"].map(AGE_GROUP_LABELS.__getitem__)),
             },
         },
         "5️⃣  Support Tickets & Customer Experience": {
@@ -1228,6 +1352,8 @@ elif page == "🧠 Analytical Insights":
 
     q   = CATEGORIES[cat][q_name]
     df  = run_query(q["sql"])
+    if not df.empty and "post" in q:
+        df = q["post"](df)
 
     st.info(f"💡 **{q['desc']}**")
 
@@ -1247,8 +1373,8 @@ elif page == "🧠 Analytical Insights":
         )
 
     st.markdown("---")
-    st.subheader("🔍 SQL Query Used")
-    st.code(q["sql"], language="sql")
+    with st.expander("🔍 SQL Query Used"):
+        st.code(q["sql"], language="sql")
 
 elif page == "👩‍💻 About Creator":
 
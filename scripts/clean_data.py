@@ -1,25 +1,75 @@
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import hashlib
+import itertools
 import json
 import os
-import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(text):
+    # orjson is strict JSON and rejects the NaN/Infinity literals json accepts
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
 
 RAW_DIR     = "data/raw"
 CLEANED_DIR = "data/cleaned"
+CACHE_DIR   = "data/cache"
 os.makedirs(CLEANED_DIR, exist_ok=True)
 
+CHUNK_SIZE      = 200_000
+JSON_CHUNK_SIZE = 50_000
+JSON_CACHE_MAX  = 16
+
+# Full-frame diagnostics in report() (row hashing, null scans) are opt-in
+VERBOSE = os.getenv("BANKSIGHT_VERBOSE") == "1"
+
+# Deletion table for everything in Latin-1 except ASCII digits (the common case;
+# clean_credit_cards falls back to a regex for anything wider)
+_KEEP_DIGITS = str.maketrans("", "", "".join(chr(c) for c in range(256) if chr(c) not in "0123456789"))
+
 
-def save_csv(df, filename):
+def save_csv(df, filename, append=False):
     path = os.path.join(CLEANED_DIR, filename)
     try:
-        df.to_csv(path, index=False, mode="w")
-        print(f"  ✅ Saved  -> {path}  ({len(df)} rows)")
+        df.to_csv(path, index=False, mode="a" if append else "w", header=not append)
+        print(f"  ✅ {'Appended' if append else 'Saved '} -> {path}  ({len(df)} rows)")
     except PermissionError:
         print(f"  ❌ Cannot write to {path}")
         print("     ➜ Please close the file if it is open in Excel or VS Code")
 
 
+def parquet_name(filename):
+    return os.path.splitext(filename)[0] + ".parquet"
+
+
+def save_parquet(df, filename, writer=None):
+    # zstd-compressed columnar copy that load_database.py reads without reparsing.
+    # Streamed outputs pass an open ParquetWriter so each chunk is appended.
+    path = os.path.join(CLEANED_DIR, filename)
+    try:
+        if writer is None:
+            df.to_parquet(path, compression="zstd", engine="pyarrow", index=False)
+        else:
+            writer.write_table(pa.Table.from_pandas(df, schema=writer.schema, preserve_index=False))
+        print(f"  ✅ Saved  -> {path}  ({len(df)} rows)")
+    except PermissionError:
+        print(f"  ❌ Cannot write to {path}")
+
+
 def load_csv(filename):
     path = os.path.join(RAW_DIR, filename)
     df = pd.read_csv(path)
@@ -27,31 +77,170 @@ def load_csv(filename):
     return df
 
 
-def load_json(filename):
+def load_csv_chunks(filename, date_formats=None, numeric=()):
     path = os.path.join(RAW_DIR, filename)
-    with open(path, "r", encoding="utf-8") as f:
-        content = f.read().strip()
+    print(f"\n📂 Streaming {filename}  (chunks of {CHUNK_SIZE:,} rows)")
+    # Every chunk infers its own dtypes, so a text column left blank in one
+    # chunk would arrive as float64 and break the .str steps: pin the text
+    # columns (all but the numeric and date ones) to str
+    typed = set(numeric) | set(date_formats or ())
+    text = {c: str for c in pd.read_csv(path, nrows=0).columns if c not in typed}
+    return pd.read_csv(path, chunksize=CHUNK_SIZE, dtype=text,
+                       parse_dates=list(date_formats or []), date_format=date_formats)
+
+
+def as_datetime(s, fmt=None):
+    # read_csv(parse_dates=...) leaves the column as object if any value fails
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s
+    parsed = pd.to_datetime(s, format=fmt, errors="coerce", cache=True)
+    # Values not in the expected format are parsed one by one, not by a format
+    # guessed from the first of them
+    retry = parsed.isna() & s.notna()
+    if fmt is not None and retry.any():
+        parsed[retry] = pd.to_datetime(s[retry], format="mixed", errors="coerce", cache=True)
+    return parsed
+
+
+def as_numeric(s):
+    if pd.api.types.is_numeric_dtype(s):
+        return s
+    return pd.to_numeric(s, errors="coerce")
+
+
+def stream_clean(table, clean_chunk):
+    # Clean a raw CSV one chunk at a time so memory stays bounded by CHUNK_SIZE.
+    # Primary keys seen in earlier chunks are tracked to keep dedup global.
+    schema = SCHEMAS[table]
+    pk = schema["pk"]
+    out_name = f"{table}_cleaned.csv"
+    seen = set()
+    rows_in = rows_out = 0
+    writer = None
+    # Both outputs are written under temporary names and only replace the
+    # previous ones once every chunk has been cleaned, so a failure part way
+    # through never leaves a truncated CSV/Parquet pair behind
+    outputs = [(f"{name}.{os.getpid()}.tmp", name) for name in (out_name, parquet_name(out_name))]
+    (tmp_csv, _), (tmp_parquet, _) = outputs
+    done = False
     try:
-        data = json.loads(content)
-        df = pd.DataFrame(data if isinstance(data, list) else [data])
-    except json.JSONDecodeError:
+        chunks = load_csv_chunks(f"{table}.csv", schema.get("dates"), schema.get("numeric", ()))
+        first = next(chunks, None)
+        if first is None:
+            # No chunks at all: clean the bare header so stale outputs from an
+            # earlier run are still replaced, by empty files with the same columns
+            first = pd.read_csv(os.path.join(RAW_DIR, f"{table}.csv"), nrows=0)
+        for i, df in enumerate(itertools.chain([first], chunks)):
+            rows_in += len(df)
+            report(df, "before")
+            df = standardize(df, pk)
+            df = df[~df[pk].isin(seen)].copy()
+            seen.update(df[pk])
+            df = safe_fillna(clean_chunk(apply_schema(df, schema)))
+            report(df, "after ")
+            df = as_cat(df, schema.get("categories", ()))
+            save_csv(df, tmp_csv, append=i > 0)
+            if writer is None:
+                writer = pq.ParquetWriter(
+                    os.path.join(CLEANED_DIR, tmp_parquet),
+                    pa.Schema.from_pandas(df, preserve_index=False),
+                    compression="zstd",
+                )
+            save_parquet(df, tmp_parquet, writer)
+            rows_out += len(df)
+        done = True
+    finally:
+        if writer is not None:
+            writer.close()
+        for tmp, name in outputs:
+            tmp_path = os.path.join(CLEANED_DIR, tmp)
+            if done:
+                os.replace(tmp_path, os.path.join(CLEANED_DIR, name))
+            elif os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    print(f"  📊 {table}.csv: {rows_in} rows read, {rows_out} rows written")
+
+
+def load_ndjson(path):
+    # One record per line: parse in bounded chunks instead of reading the whole file
+    reader = pd.read_json(path, lines=True, chunksize=JSON_CHUNK_SIZE,
+                          dtype=False, convert_dates=False)
+    with reader:
+        return pd.concat(reader, ignore_index=True)
+
+
+def parse_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(64).lstrip()[:1]
+    df = None
+    if head == "{":
         try:
-            records = [json.loads(line) for line in content.splitlines() if line.strip()]
-            df = pd.DataFrame(records)
+            df = load_ndjson(path)
+        except ValueError:
+            df = None
+    if df is None:
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read().strip()
+        try:
+            data = json_loads(content)
+            df = pd.DataFrame(data if isinstance(data, list) else [data])
         except json.JSONDecodeError:
-            fixed = "[" + content.replace("}\n{", "},{").replace("}\r\n{", "},{") + "]"
-            data = json.loads(fixed)
-            df = pd.DataFrame(data)
+            try:
+                records = [json_loads(line) for line in content.splitlines() if line.strip()]
+                df = pd.DataFrame(records)
+            except json.JSONDecodeError:
+                fixed = "[" + content.replace("}\n{", "},{").replace("}\r\n{", "},{") + "]"
+                data = json_loads(fixed)
+                df = pd.DataFrame(data)
+    return df
+
+
+def evict_cache(keep=JSON_CACHE_MAX):
+    # Least recently used first: hits touch their file's mtime
+    entries = []
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        try:
+            entries.append((os.path.getmtime(path), path))
+        except FileNotFoundError:
+            pass
+    for _, path in sorted(entries)[:max(len(entries) - keep, 0)]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def load_json(filename):
+    path = os.path.join(RAW_DIR, filename)
+    # Parsed frames are pickled per source version; an edited file gets a new key
+    stat = os.stat(path)
+    key = hashlib.sha1(f"{os.path.abspath(path)}:{stat.st_mtime}:{stat.st_size}".encode()).hexdigest()
+    cache_path = os.path.join(CACHE_DIR, f"{key}.pkl")
+    try:
+        df = pd.read_pickle(cache_path)
+        os.utime(cache_path)
+    except Exception:
+        # Missing, truncated or corrupt entries are all a miss; rewrite them
+        df = parse_json(path)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, cache_path)
+        evict_cache()
     print(f"\n📂 Loaded {filename}  ({len(df)} rows, {len(df.columns)} cols)")
     return df
 
 
 def report(df, name):
+    if not VERBOSE:
+        print(f"  🔍 {name} -- {len(df)} rows  |  missing/duplicates: skipped (BANKSIGHT_VERBOSE=1)")
+        return
     total_dups = df.duplicated().sum()
     missing = {}
     for col in df.columns:
         null_cnt = int(df[col].isnull().sum())
-        if df[col].dtype == object:
+        if pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col]):
             empty_cnt = int((df[col].fillna("").astype(str).str.strip() == "").sum()) - null_cnt
             empty_cnt = max(empty_cnt, 0)
         else:
@@ -70,177 +259,214 @@ def report(df, name):
 
 
 def safe_fillna(df):
-    for col in df.select_dtypes(include="object").columns:
-        df[col] = df[col].fillna("Unknown")
-    for col in df.select_dtypes(include=["float64", "int64"]).columns:
-        df[col] = df[col].fillna(0)
+    # Fill by dtype so numeric and datetime columns are never upcast to object
+    text_cols = df.select_dtypes(include=["object", "string"]).columns
+    df[text_cols] = df[text_cols].fillna("Unknown")
+    for col in df.select_dtypes(include="category").columns:
+        if df[col].isna().any():
+            if "Unknown" not in df[col].cat.categories:
+                df[col] = df[col].cat.add_categories("Unknown")
+            df[col] = df[col].fillna("Unknown")
+    num_cols = df.select_dtypes(include="number").columns
+    df[num_cols] = df[num_cols].fillna(0)
     return df
 
 
-def clean_customers():
-    df = load_csv("customers.csv")
-    report(df, "before")
+def norm_cat(s):
+    # Strip/title-case each distinct value once, then map back through the codes
+    c = s.astype("category")
+    cats = c.cat.categories
+    return c.map(dict(zip(cats, cats.str.strip().str.title()))).astype("category")
+
+
+def as_cat(df, cols):
+    for col in cols:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+# Per-table cleaning rules shared by every cleaner: primary key for dedup,
+# numeric coercion, date formats (same layout for parsing and output),
+# strip+title-case and category columns.
+SCHEMAS = {
+    "customers": {
+        "pk":         "customer_id",
+        "numeric":    ["age"],
+        "dates":      {"join_date": "%Y-%m-%d"},
+        "title":      ["city", "account_type"],
+        "categories": ["gender", "account_type"],
+    },
+    "accounts": {
+        "pk":         "customer_id",
+        "numeric":    ["account_balance"],
+        "dates":      {"last_updated": "%Y-%m-%d %H:%M:%S"},
+    },
+    "transactions": {
+        "pk":         "txn_id",
+        "numeric":    ["amount"],
+        "dates":      {"txn_time": "%Y-%m-%d %H:%M:%S"},
+        "title":      ["status", "txn_type"],
+        "categories": ["status", "txn_type"],
+    },
+    "loans": {
+        "pk":         "loan_id",
+        "numeric":    ["loan_amount", "interest_rate", "loan_term_months"],
+        "dates":      {"start_date": "%Y-%m-%d", "end_date": "%Y-%m-%d"},
+        "title":      ["loan_status", "loan_type"],
+        "categories": ["loan_status", "loan_type"],
+    },
+    "credit_cards": {
+        "pk":         "card_id",
+        "numeric":    ["credit_limit", "current_balance"],
+        "dates":      {"issued_date": "%Y-%m-%d", "expiry_date": "%Y-%m-%d"},
+        "title":      ["card_type", "card_network", "status"],
+        "categories": ["card_type", "card_network", "status"],
+    },
+    "branches": {
+        "pk":         "branch_id",
+        "numeric":    ["total_employees", "branch_revenue", "performance_rating"],
+        "dates":      {"opening_date": "%Y-%m-%d"},
+        "title":      ["branch_name", "city", "manager_name"],
+    },
+    "support_tickets": {
+        "pk":         "ticket_id",
+        "title":      ["priority", "status", "issue_category", "channel"],
+        "categories": ["priority", "status", "issue_category", "channel"],
+    },
+}
+
+
+def dedupe(df, pk):
+    # is_unique is one pass; only hash-dedupe when a repeated key is present
+    if df[pk].is_unique:
+        return df
+    return df.drop_duplicates(subset=[pk], keep="first", ignore_index=True)
+
+
+def standardize(df, pk):
     df.columns = [c.strip().lower().replace(" ", "_") for c in df.columns]
-    df.drop_duplicates(subset=["customer_id"], keep="first", inplace=True)
-    str_cols = df.select_dtypes(include="object").columns
-    df[str_cols] = df[str_cols].apply(lambda col: col.str.strip())
-    if "gender" in df.columns:
-        df["gender"] = df["gender"].str.upper().str.strip()
-        df["gender"] = df["gender"].apply(
-            lambda v: "M" if v in ("M", "MALE") else
-                      "F" if v in ("F", "FEMALE") else "Other"
-        )
-    if "age" in df.columns:
-        df["age"] = pd.to_numeric(df["age"], errors="coerce")
-        df = df[df["age"].between(18, 100)]
-    if "join_date" in df.columns:
-        df["join_date"] = pd.to_datetime(df["join_date"], errors="coerce")
-        df["join_date"] = df["join_date"].dt.strftime("%Y-%m-%d")
-    for col in ("city", "account_type"):
+    return dedupe(df, pk)
+
+
+def apply_schema(df, schema):
+    for col in schema.get("numeric", ()):
+        if col in df.columns:
+            df[col] = as_numeric(df[col])
+    for col, fmt in schema.get("dates", {}).items():
         if col in df.columns:
-            df[col] = df[col].str.title()
+            df[col] = as_datetime(df[col], fmt).dt.strftime(fmt)
+    # Low-cardinality columns are normalised per category, the rest per row
+    categories = schema.get("categories", ())
+    title = [c for c in schema.get("title", ()) if c in df.columns and c not in categories]
+    if title:
+        df[title] = df[title].apply(lambda s: s.str.strip().str.title())
+    for col in schema.get("title", ()):
+        if col in df.columns and col in categories:
+            df[col] = norm_cat(df[col])
+    return df
+
+
+def load_raw(table):
+    for filename, loader in ((f"{table}.json", load_json), (f"{table}.csv", load_csv)):
+        if os.path.exists(os.path.join(RAW_DIR, filename)):
+            return loader(filename)
+    print(f"⚠️  {table} file not found -- skipping")
+    return None
+
+
+def finish(df, table):
     df = safe_fillna(df)
     report(df, "after ")
-    save_csv(df, "customers_cleaned.csv")
+    df = as_cat(df, SCHEMAS[table].get("categories", ()))
+    save_csv(df, f"{table}_cleaned.csv")
+    save_parquet(df, f"{table}_cleaned.parquet")
 
 
-def clean_accounts():
-    df = load_csv("accounts.csv")
-    report(df, "before")
-    df.columns = [c.strip().lower().replace(" ", "_") for c in df.columns]
-    df.drop_duplicates(subset=["customer_id"], keep="first", inplace=True)
+def _clean_customers_chunk(df):
+    # Arrow-backed strings: strip/upper/title run in Arrow compute kernels
+    for col in df.select_dtypes(include="object").columns:
+        df[col] = df[col].astype("string[pyarrow]").str.strip()
+    if "gender" in df.columns:
+        df["gender"] = df["gender"].str.upper().str.strip()
+        is_m = df["gender"].isin(["M", "MALE"])
+        is_f = df["gender"].isin(["F", "FEMALE"])
+        df["gender"] = np.where(is_m, "M", np.where(is_f, "F", "Other"))
+    if "age" in df.columns:
+        df = df[df["age"].between(18, 100)].copy()
+    return df
+
+
+def clean_customers():
+    stream_clean("customers", _clean_customers_chunk)
+
+
+def _clean_accounts_chunk(df):
     if "account_balance" in df.columns:
-        df["account_balance"] = pd.to_numeric(df["account_balance"], errors="coerce")
-        df = df[df["account_balance"] >= 0]
-    if "last_updated" in df.columns:
-        df["last_updated"] = pd.to_datetime(df["last_updated"], errors="coerce")
-        df["last_updated"] = df["last_updated"].dt.strftime("%Y-%m-%d %H:%M:%S")
-    df["account_balance"] = df["account_balance"].fillna(0.0)
-    df = safe_fillna(df)
-    report(df, "after ")
-    save_csv(df, "accounts_cleaned.csv")
+        df = df[df["account_balance"] >= 0].copy()
+    return df
 
 
-def clean_transactions():
-    df = load_csv("transactions.csv")
-    report(df, "before")
-    df.columns = [c.strip().lower().replace(" ", "_") for c in df.columns]
-    df.drop_duplicates(subset=["txn_id"], keep="first", inplace=True)
+def clean_accounts():
+    stream_clean("accounts", _clean_accounts_chunk)
+
+
+def _clean_transactions_chunk(df):
     if "amount" in df.columns:
-        df["amount"] = pd.to_numeric(df["amount"], errors="coerce")
-        df = df[df["amount"] > 0]
-    if "txn_time" in df.columns:
-        df["txn_time"] = pd.to_datetime(df["txn_time"], errors="coerce")
-        df["txn_time"] = df["txn_time"].dt.strftime("%Y-%m-%d %H:%M:%S")
-    for col in ("status", "txn_type"):
-        if col in df.columns:
-            df[col] = df[col].str.strip().str.title()
-    df = safe_fillna(df)
-    report(df, "after ")
-    save_csv(df, "transactions_cleaned.csv")
+        df = df[df["amount"] > 0].copy()
+    return df
+
+
+def clean_transactions():
+    stream_clean("transactions", _clean_transactions_chunk)
 
 
 def clean_loans():
-    json_path = os.path.join(RAW_DIR, "loans.json")
-    csv_path  = os.path.join(RAW_DIR, "loans.csv")
-    if os.path.exists(json_path):
-        df = load_json("loans.json")
-    elif os.path.exists(csv_path):
-        df = load_csv("loans.csv")
-    else:
-        print("⚠️  loans file not found -- skipping")
+    df = load_raw("loans")
+    if df is None:
         return
     report(df, "before")
-    df.columns = [c.strip().lower().replace(" ", "_") for c in df.columns]
-    df.drop_duplicates(subset=["loan_id"], keep="first", inplace=True)
-    for num_col in ("loan_amount", "interest_rate", "loan_term_months"):
-        if num_col in df.columns:
-            df[num_col] = pd.to_numeric(df[num_col], errors="coerce")
-    for date_col in ("start_date", "end_date"):
-        if date_col in df.columns:
-            df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
-            df[date_col] = df[date_col].dt.strftime("%Y-%m-%d")
-    if "loan_status" in df.columns:
-        df["loan_status"] = df["loan_status"].str.strip().str.title()
-    if "loan_type" in df.columns:
-        df["loan_type"] = df["loan_type"].str.strip().str.title()
-    df = safe_fillna(df)
-    report(df, "after ")
-    save_csv(df, "loans_cleaned.csv")
+    df = apply_schema(standardize(df, "loan_id"), SCHEMAS["loans"])
+    finish(df, "loans")
 
 
 def clean_credit_cards():
-    json_path = os.path.join(RAW_DIR, "credit_cards.json")
-    if not os.path.exists(json_path):
-        print("⚠️  credit_cards.json not found -- skipping")
+    df = load_raw("credit_cards")
+    if df is None:
         return
-    df = load_json("credit_cards.json")
     report(df, "before")
-    df.columns = [c.strip().lower().replace(" ", "_") for c in df.columns]
-    df.drop_duplicates(subset=["card_id"], keep="first", inplace=True)
-    for num_col in ("credit_limit", "current_balance"):
-        if num_col in df.columns:
-            df[num_col] = pd.to_numeric(df[num_col], errors="coerce")
-    for date_col in ("issued_date", "expiry_date"):
-        if date_col in df.columns:
-            df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
-            df[date_col] = df[date_col].dt.strftime("%Y-%m-%d")
-    for str_col in ("card_type", "card_network", "status"):
-        if str_col in df.columns:
-            df[str_col] = df[str_col].str.strip().str.title()
+    df = apply_schema(standardize(df, "card_id"), SCHEMAS["credit_cards"])
     if "card_number" in df.columns:
-        df["card_number"] = df["card_number"].astype(str).apply(
-            lambda v: "**** **** **** " + re.sub(r"\D", "", v)[-4:]
-            if len(re.sub(r"\D", "", v)) >= 4 else "****"
+        digits = df["card_number"].astype(str).str.translate(_KEEP_DIGITS)
+        # The table only covers Latin-1; rows still holding other characters
+        # (figure spaces, en dashes, ...) go through the regex
+        wide = ~digits.map(str.isascii)
+        if wide.any():
+            digits[wide] = digits[wide].str.replace(r"\D", "", regex=True)
+        df["card_number"] = np.where(
+            digits.str.len() >= 4, "**** **** **** " + digits.str.slice(-4), "****"
         )
-    df = safe_fillna(df)
-    report(df, "after ")
-    save_csv(df, "credit_cards_cleaned.csv")
+    finish(df, "credit_cards")
 
 
 def clean_branches():
-    json_path = os.path.join(RAW_DIR, "branches.json")
-    csv_path  = os.path.join(RAW_DIR, "branches.csv")
-    if os.path.exists(json_path):
-        df = load_json("branches.json")
-    elif os.path.exists(csv_path):
-        df = load_csv("branches.csv")
-    else:
-        print("⚠️  branches file not found -- skipping")
+    df = load_raw("branches")
+    if df is None:
         return
     report(df, "before")
-    df.columns = [c.strip().lower().replace(" ", "_") for c in df.columns]
-    df.drop_duplicates(subset=["branch_id"], keep="first", inplace=True)
-    for num_col in ("total_employees", "branch_revenue", "performance_rating"):
-        if num_col in df.columns:
-            df[num_col] = pd.to_numeric(df[num_col], errors="coerce")
-    if "opening_date" in df.columns:
-        df["opening_date"] = pd.to_datetime(df["opening_date"], errors="coerce")
-        df["opening_date"] = df["opening_date"].dt.strftime("%Y-%m-%d")
+    df = apply_schema(standardize(df, "branch_id"), SCHEMAS["branches"])
     if "performance_rating" in df.columns:
         df["performance_rating"] = df["performance_rating"].clip(1, 5)
-    for str_col in ("branch_name", "city", "manager_name"):
-        if str_col in df.columns:
-            df[str_col] = df[str_col].str.strip().str.title()
-    df = safe_fillna(df)
-    report(df, "after ")
-    save_csv(df, "branches_cleaned.csv")
+    finish(df, "branches")
 
 
 def clean_support_tickets():
-    json_path = os.path.join(RAW_DIR, "support_tickets.json")
-    csv_path  = os.path.join(RAW_DIR, "support_tickets.csv")
-    if os.path.exists(json_path):
-        df = load_json("support_tickets.json")
-    elif os.path.exists(csv_path):
-        df = load_csv("support_tickets.csv")
-    else:
-        print("⚠️  support_tickets file not found -- skipping")
+    df = load_raw("support_tickets")
+    if df is None:
         return
 
     # Standardise column names first
-    df.columns = [c.strip().lower().replace(" ", "_") for c in df.columns]
-    df.drop_duplicates(subset=["ticket_id"], keep="first", inplace=True)
+    df = standardize(df, "ticket_id")
 
     # Convert empty strings to NaN so report() counts them as missing
     for col in df.columns:
@@ -258,57 +484,52 @@ def clean_support_tickets():
     if "loan_id" in df.columns:
         df["loan_id"] = df["loan_id"].fillna(0).astype(int)
 
-    # date_closed: missing → 'Not Closed'  (ticket is still open/unresolved)
-    if "date_closed" in df.columns:
-        df["date_closed"] = df["date_closed"].fillna("Not Closed")
-
-    # Format date_opened
+    # Parse each date column once; the parsed values feed both the
+    # formatted output and the resolution-days computation
+    opened = closed = None
     if "date_opened" in df.columns:
-        df["date_opened"] = pd.to_datetime(df["date_opened"], errors="coerce")
-        df["date_opened"] = df["date_opened"].dt.strftime("%Y-%m-%d")
+        opened = as_datetime(df["date_opened"], "%Y-%m-%d")
+        df["date_opened"] = opened.dt.strftime("%Y-%m-%d")
 
-    # Format date_closed only for rows with actual dates (skip 'Not Closed')
+    # date_closed: missing → 'Not Closed'  (ticket is still open/unresolved)
     if "date_closed" in df.columns:
-        mask = df["date_closed"] != "Not Closed"
-        df.loc[mask, "date_closed"] = (
-            pd.to_datetime(df.loc[mask, "date_closed"], errors="coerce")
-            .dt.strftime("%Y-%m-%d")
+        closed = as_datetime(df["date_closed"], "%Y-%m-%d")
+        df["date_closed"] = (
+            closed.dt.strftime("%Y-%m-%d").where(df["date_closed"].notna(), "Not Closed")
         )
 
-    # Compute resolution days (0 for open tickets)
-    if "date_opened" in df.columns and "date_closed" in df.columns:
+    # Compute resolution days (0 for open tickets) between calendar dates,
+    # so a ticket closed after midnight counts a day even if <24h passed
+    if opened is not None and closed is not None:
         df["resolution_days"] = (
-            pd.to_datetime(df["date_closed"], errors="coerce") -
-            pd.to_datetime(df["date_opened"], errors="coerce")
-        ).dt.days
-        df["resolution_days"] = (
-            df["resolution_days"].clip(lower=0).fillna(0).astype(int)
+            (closed.dt.normalize() - opened.dt.normalize()).dt.days.clip(lower=0).fillna(0).astype(int)
         )
 
     if "customer_rating" in df.columns:
         df["customer_rating"] = pd.to_numeric(df["customer_rating"], errors="coerce")
         df["customer_rating"] = df["customer_rating"].clip(1, 5).fillna(3).astype(int)
 
-    for str_col in ("priority", "status", "issue_category", "channel"):
-        if str_col in df.columns:
-            df[str_col] = df[str_col].str.strip().str.title()
+    df = apply_schema(df, SCHEMAS["support_tickets"])
+    finish(df, "support_tickets")
 
-    df = safe_fillna(df)
-    report(df, "after ")
-    save_csv(df, "support_tickets_cleaned.csv")
+
+CLEANERS = [
+    clean_customers, clean_accounts, clean_transactions, clean_loans,
+    clean_credit_cards, clean_branches, clean_support_tickets,
+]
+
+
+def _run(cleaner):
+    cleaner()
 
 
 if __name__ == "__main__":
     print("\n" + "=" * 55)
     print("   BankSight -- Data Cleaning Pipeline")
     print("=" * 55)
-    clean_customers()
-    clean_accounts()
-    clean_transactions()
-    clean_loans()
-    clean_credit_cards()
-    clean_branches()
-    clean_support_tickets()
+    # Each cleaner reads and writes its own files, so they run in parallel
+    with ProcessPoolExecutor(max_workers=min(len(CLEANERS), os.cpu_count() or 1)) as ex:
+        list(ex.map(_run, CLEANERS))
     print("\n" + "=" * 55)
     print("   ✅ All datasets cleaned successfully!")
     print("=" * 55 + "\n")
\ No newline at end of file
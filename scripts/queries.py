@@ -1,13 +1,196 @@
+import atexit
+import contextlib
+import hashlib
+import os
 import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
+import pyarrow as pa
+
+try:
+    import connectorx as cx
+except ImportError:
+    cx = None
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
 
 DB_PATH = "database/banksight.db"
+RESULT_CACHE_MAX = 64
+FETCH_BATCH_ROWS = 10_000
+PRETTY_MAX_ROWS  = 50
+
+# Covering indexes for Q1–Q15: each holds the join/filter/group keys first and
+# the aggregated columns after, so the queries read the index alone and
+# GROUP BY / ORDER BY can follow index order instead of a temp B-tree sort.
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_q_accounts_customer  ON accounts(customer_id, account_balance)",
+    "CREATE INDEX IF NOT EXISTS idx_q_accounts_balance   ON accounts(account_balance, customer_id)",
+    "CREATE INDEX IF NOT EXISTS idx_q_customers_city     ON customers(city, customer_id)",
+    "CREATE INDEX IF NOT EXISTS idx_q_customers_type     ON customers(account_type, customer_id)",
+    "CREATE INDEX IF NOT EXISTS idx_q_customers_join     ON customers(join_date)",
+    "CREATE INDEX IF NOT EXISTS idx_q_customers_age      ON customers(age)",
+    "CREATE INDEX IF NOT EXISTS idx_q_txn_type           ON transactions(txn_type, amount, status)",
+    # Same definition and name as load_database.py's, for databases loaded
+    # before the loader created it
+    "CREATE INDEX IF NOT EXISTS idx_transactions_customer ON transactions(customer_id, amount)",
+    "CREATE INDEX IF NOT EXISTS idx_q_loans_customer     ON loans(customer_id, loan_id, loan_status, loan_type, loan_amount, interest_rate)",
+    "CREATE INDEX IF NOT EXISTS idx_q_loans_type         ON loans(loan_type, loan_amount, interest_rate)",
+    "CREATE INDEX IF NOT EXISTS idx_q_loans_branch       ON loans(branch, loan_amount)",
+    "CREATE INDEX IF NOT EXISTS idx_q_tickets_category   ON support_tickets(issue_category, resolution_days)",
+    # Expression index matching Q15's case-insensitive LOWER(...) filters
+    "CREATE INDEX IF NOT EXISTS idx_q_tickets_lower      ON support_tickets(LOWER(priority), LOWER(status), customer_rating, support_agent)",
+]
+
+def _index_names(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+def ensure_indexes(conn):
+    before = _index_names(conn)
+    for ddl in INDEXES:
+        conn.execute(ddl)
+    # Planner statistics (sqlite_stat1) so index choice and join order follow
+    # the real key distributions; refreshed whenever an index is new
+    has_stats = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone()
+    if not has_stats or _index_names(conn) != before:
+        conn.execute("ANALYZE")
+    conn.commit()
+
+@atexit.register
+def optimize_db():
+    # Let SQLite re-analyze whatever its statistics say has drifted (only if
+    # this process used the database; connecting would create a missing file)
+    if not _prepared:
+        return
+    try:
+        with contextlib.closing(sqlite3.connect(DB_PATH)) as conn:
+            conn.execute("PRAGMA optimize")
+    except sqlite3.OperationalError:
+        pass
+
+# One connection per thread, opened on first use and closed at interpreter exit
+_local = threading.local()
+_open_conns = []
+_prepared = False
+_prepare_lock = threading.Lock()
+
+def _prepare_db_once():
+    # The query connections are read-only, so indexes go through a
+    # short-lived writable one; a read-only database file just runs without them.
+    global _prepared
+    with _prepare_lock:
+        if _prepared:
+            return
+        try:
+            with contextlib.closing(sqlite3.connect(DB_PATH)) as conn:
+                ensure_indexes(conn)
+        except sqlite3.OperationalError as e:
+            print(f"  ⚠️  Could not prepare query indexes: {e}")
+        _prepared = True
+
+# IN-MEMORY SHADOW — the database file is copied once into a single named
+# in-memory database (SQLite's memdb VFS; a "/" name makes it shared by every
+# connection in the process), and each thread's read-only query connection
+# opens that same copy, so queries do no file I/O, threads never contend on
+# one connection, and memory holds one copy however many threads run.
+# refresh_shadow() (called by invalidate_cache) re-copies the file after it
+# has been written; every connection sees the new contents at once.
+# BANKSIGHT_IN_MEMORY=0 reads the file directly instead (and lets
+# read_columnar use ConnectorX, which can only see the file).
+IN_MEMORY = os.getenv("BANKSIGHT_IN_MEMORY", "1") != "0"
+SHADOW_URI = "file:/banksight?vfs=memdb"
+_shadow = None
+_shadow_stamp = None
+_shadow_lock = threading.Lock()
+
+def _db_stamp():
+    stamp = []
+    for path in (DB_PATH, DB_PATH + "-wal"):
+        try:
+            st = os.stat(path)
+            stamp.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            stamp.append(None)
+    return tuple(stamp)
+
+def refresh_shadow(force=False):
+    global _shadow, _shadow_stamp
+    if not IN_MEMORY:
+        return
+    with _shadow_lock:
+        stamp = _db_stamp()
+        if _shadow is not None and stamp == _shadow_stamp and not force:
+            return
+        if _shadow is None:
+            # Holds the shared copy open for the life of the process
+            _shadow = sqlite3.connect(SHADOW_URI, uri=True, check_same_thread=False)
+            _open_conns.append(_shadow)
+        with contextlib.closing(sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)) as source:
+            image = bytearray(source.serialize())
+        # A WAL database's header (bytes 18-19 = 2) would be copied too, and
+        # memdb cannot open a WAL database: mark the image rollback-journal
+        image[18] = image[19] = 1
+        with contextlib.closing(sqlite3.connect(":memory:")) as staging:
+            staging.deserialize(image)
+            staging.backup(_shadow)
+        _shadow_stamp = stamp
 
 def get_connection():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        _prepare_db_once()
+        if IN_MEMORY:
+            # Set only once the first copy is complete; threads that arrive
+            # during it wait on the lock instead of opening an empty database
+            if _shadow_stamp is None:
+                refresh_shadow()
+            uri = SHADOW_URI
+        else:
+            uri = f"file:{DB_PATH}?mode=ro"
+        # check_same_thread=False only so the atexit hook (main thread) can
+        # close connections opened by worker threads
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        # Read-only: the analytics queries never write
+        conn.executescript("""
+            PRAGMA temp_store = MEMORY;
+            PRAGMA query_only = ON;
+        """)
+        _local.conn = conn
+        _open_conns.append(conn)
     return conn
 
+@atexit.register
+def close_connections():
+    while _open_conns:
+        _open_conns.pop().close()
+    _local.__dict__.clear()
+
+# SHARED LOAN LISTS — Q10 and Q11 count, sum, average and round in SQL; only
+# their ' | '-joined type lists and distinct status lists are built in
+# pandas, from one loans read (one result-cache entry), and merged in by
+# customer_id. Rows come in loan_id order within each customer.
+
+LOAN_LISTS_SQL = " ".join("""
+    SELECT customer_id, loan_type, loan_status
+    FROM loans
+    ORDER BY customer_id, loan_id;
+""".split())
+
+def _loan_lists(keep, **lists):
+    # {out_col: (col, join)} per customer over the loans rows whose lower-cased
+    # status passes keep()
+    loans = _cached_fetch(LOAN_LISTS_SQL, ())
+    loans = loans[keep(loans["loan_status"].str.lower())]
+    by_customer = loans.groupby("customer_id", sort=False, dropna=False)
+    return {name: by_customer[col].agg(join) for name, (col, join) in lists.items()}
+
 # CATEGORY 1 — CUSTOMER & ACCOUNT ANALYSIS
 
 Q1 = {
@@ -21,7 +204,7 @@ Q1 = {
         FROM customers c
         JOIN accounts a ON c.customer_id = a.customer_id
         GROUP BY c.city
-        ORDER BY total_customers DESC
+        ORDER BY total_customers DESC, c.city DESC
         LIMIT 15;
     """
 }
@@ -54,7 +237,7 @@ Q3 = {
             ROUND(a.account_balance, 2) AS account_balance
         FROM customers c
         JOIN accounts a ON c.customer_id = a.customer_id
-        ORDER BY a.account_balance DESC
+        ORDER BY a.account_balance DESC, a.customer_id DESC
         LIMIT 10;
     """
 }
@@ -71,53 +254,61 @@ Q4 = {
             ROUND(a.account_balance, 2) AS account_balance
         FROM customers c
         JOIN accounts a ON c.customer_id = a.customer_id
-        WHERE strftime('%Y', c.join_date) = '2023'
-          AND a.account_balance > 100000
+        WHERE c.join_date >= ? AND c.join_date < ?
+          AND a.account_balance > ?
         ORDER BY a.account_balance DESC;
-    """
+    """,
+    "params": ("2023-01-01", "2024-01-01", 100000),
 }
 
 # CATEGORY 2 — TRANSACTION BEHAVIOR
 
+# Q5/Q6/Q7 are projections of one grouped read of transactions (one
+# result-cache entry); every number is computed and rounded in SQL
+TXN_BY_TYPE_SQL = """
+    SELECT
+        txn_type                                                           AS transaction_type,
+        ROUND(SUM(amount), 2)                                              AS total_transaction_volume,
+        SUM(CASE WHEN LOWER(status) = 'failed' THEN 1 ELSE 0 END)          AS failed_transactions,
+        ROUND(SUM(CASE WHEN LOWER(status) = 'failed' THEN amount END), 2)  AS total_failed_amount,
+        COUNT(*)                                                           AS total_transactions,
+        ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER (), 2)                 AS pct_share
+    FROM transactions
+    GROUP BY txn_type;
+"""
+
+def _txn_volume(txn):
+    df = txn[["transaction_type", "total_transaction_volume"]]
+    return df.sort_values("total_transaction_volume", ascending=False, kind="stable").reset_index(drop=True)
+
+def _txn_failed(txn):
+    df = txn.loc[txn["failed_transactions"] > 0,
+                 ["transaction_type", "failed_transactions", "total_failed_amount"]]
+    return df.sort_values("failed_transactions", ascending=False, kind="stable").reset_index(drop=True)
+
+def _txn_counts(txn):
+    df = txn[["transaction_type", "total_transactions", "pct_share"]]
+    return df.sort_values("total_transactions", ascending=False, kind="stable").reset_index(drop=True)
+
 Q5 = {
     "title": "Q5 — Total Transaction Volume by Type",
     "description": "What is the total transaction volume (sum of amounts) by transaction type?",
-    "sql": """
-        SELECT
-            txn_type                      AS transaction_type,
-            ROUND(SUM(amount), 2)         AS total_transaction_volume
-        FROM transactions
-        GROUP BY txn_type
-        ORDER BY total_transaction_volume DESC;
-    """
+    "sql": TXN_BY_TYPE_SQL,
+    "post": _txn_volume,
 }
 
 Q6 = {
     "title": "Q6 — Failed Transactions by Type",
     "description": "How many failed transactions occurred for each transaction type?",
-    "sql": """
-        SELECT
-            txn_type                      AS transaction_type,
-            COUNT(*)                      AS failed_transactions,
-            ROUND(SUM(amount), 2)         AS total_failed_amount
-        FROM transactions
-        WHERE LOWER(status) = 'failed'
-        GROUP BY txn_type
-        ORDER BY failed_transactions DESC;
-    """
+    "sql": TXN_BY_TYPE_SQL,
+    "post": _txn_failed,
 }
 
 Q7 = {
     "title": "Q7 — Total Number of Transactions per Type",
     "description": "What is the total number of transactions per transaction type?",
-    "sql": """
-        SELECT
-            txn_type                      AS transaction_type,
-            COUNT(*)                      AS total_transactions
-        FROM transactions
-        GROUP BY txn_type
-        ORDER BY total_transactions DESC;
-    """
+    "sql": TXN_BY_TYPE_SQL,
+    "post": _txn_counts,
 }
 
 Q8 = {
@@ -127,14 +318,20 @@ Q8 = {
         SELECT
             c.name,
             c.account_type,
-            COUNT(*)                AS high_value_count,
-            ROUND(SUM(t.amount), 2) AS total_high_value
-        FROM transactions t
+            t.high_value_count,
+            t.total_high_value
+        FROM (
+            SELECT
+                customer_id,
+                COUNT(*)              AS high_value_count,
+                ROUND(SUM(amount), 2) AS total_high_value
+            FROM transactions
+            WHERE amount > 20000
+            GROUP BY customer_id
+            HAVING COUNT(*) >= 5
+        ) t
         JOIN customers c ON t.customer_id = c.customer_id
-        WHERE t.amount > 20000
-        GROUP BY t.customer_id
-        HAVING COUNT(*) >= 5
-        ORDER BY high_value_count DESC;
+        ORDER BY t.high_value_count DESC, t.customer_id DESC;
     """
 }
 
@@ -155,6 +352,26 @@ Q9 = {
     """
 }
 
+def _join_types(s):
+    return " | ".join(s.dropna())
+
+def _join_distinct(s):
+    return ",".join(dict.fromkeys(s.dropna()))
+
+def _with_active_loan_types(df):
+    lists = _loan_lists(lambda status: status.isin(["active", "approved"]),
+                        loan_types_held=("loan_type", _join_types))
+    df.insert(2, "loan_types_held", df["customer_id"].map(lists["loan_types_held"]))
+    return df
+
+def _with_outstanding_loan_lists(df):
+    lists = _loan_lists(lambda status: status.notna() & (status != "closed"),
+                        loan_types=("loan_type", _join_types),
+                        loan_statuses=("loan_status", _join_distinct))
+    df.insert(2, "loan_types", df["customer_id"].map(lists["loan_types"]))
+    df.insert(3, "loan_statuses", df["customer_id"].map(lists["loan_statuses"]))
+    return df
+
 Q10 = {
     "title": "Q10 — Customers with More Than One Active/Approved Loan",
     "description": "Which customers currently hold more than one active or approved loan?",
@@ -162,7 +379,6 @@ Q10 = {
         SELECT
             l.customer_id,
             COUNT(l.loan_id)                    AS no_of_active_loans,
-            GROUP_CONCAT(l.loan_type, ' | ')    AS loan_types_held,
             ROUND(SUM(l.loan_amount), 2)        AS total_loan_amount,
             ROUND(AVG(l.interest_rate), 2)      AS avg_interest_rate
         FROM loans l
@@ -171,7 +387,8 @@ Q10 = {
         HAVING COUNT(l.loan_id) > 1
         ORDER BY no_of_active_loans DESC, total_loan_amount DESC
         LIMIT 20;
-    """
+    """,
+    "post": _with_active_loan_types,
 }
 
 Q11 = {
@@ -181,15 +398,14 @@ Q11 = {
         SELECT
             l.customer_id,
             COUNT(l.loan_id)                        AS number_of_loans,
-            GROUP_CONCAT(l.loan_type, ' | ')        AS loan_types,
-            GROUP_CONCAT(DISTINCT l.loan_status)    AS loan_statuses,
             ROUND(SUM(l.loan_amount), 2)            AS total_outstanding_amount
         FROM loans l
         WHERE LOWER(l.loan_status) != 'closed'
         GROUP BY l.customer_id
         ORDER BY total_outstanding_amount DESC
         LIMIT 5;
-    """
+    """,
+    "post": _with_outstanding_loan_lists,
 }
 
 # CATEGORY 4 — BRANCH & PERFORMANCE
@@ -221,7 +437,8 @@ Q13 = {
                 WHEN age BETWEEN 46 AND 60 THEN '46–60'
                 ELSE '60+'
             END AS age_group,
-            COUNT(*) AS total_customers
+            COUNT(*) AS total_customers,
+            ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER (), 2) AS pct_share
         FROM customers
         GROUP BY age_group
         ORDER BY
@@ -249,7 +466,7 @@ Q14 = {
         WHERE resolution_days IS NOT NULL
           AND resolution_days > 0
         GROUP BY issue_category
-        ORDER BY avg_resolution_days DESC
+        ORDER BY avg_resolution_days DESC, issue_category DESC
         LIMIT 10;
     """
 }
@@ -277,40 +494,213 @@ Q15 = {
 ALL_QUERIES = [Q1, Q2, Q3, Q4, Q5, Q6, Q7, Q8,
                Q9, Q10, Q11, Q12, Q13, Q14, Q15]
 
+def sql_hash(sql: str) -> bytes:
+    return hashlib.blake2b(sql.encode(), digest_size=16).digest()
+
+# Canonical SQL: collapse the layout whitespace once at import (no query has
+# comments or whitespace inside string literals), and precompute the hash the
+# result cache is keyed on
+for _q in ALL_QUERIES:
+    _q["sql"] = " ".join(_q["sql"].split())
+    _q["_hash"] = sql_hash(_q["sql"])
+
 # RUNNER — test all queries from command line
 
+# Results keyed by (SQL hash, params), and finished "post" frames by
+# (SQL hash, params, post); the data only changes when load_database.py reruns
+_RESULT_CACHE: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+_cache_lock = threading.Lock()
+_inflight: "dict[tuple, threading.Lock]" = {}
+
+def invalidate_cache():
+    # Writers call this after changing the database file
+    refresh_shadow()
+    with _cache_lock:
+        _RESULT_CACHE.clear()
+
+def _unify(chunks):
+    # A batch that is all NULL infers the null type; cast it to the column's
+    # real type. Two different real types (SQLite's dynamic typing) -> None.
+    types = {c.type for c in chunks if not pa.types.is_null(c.type)}
+    if len(types) > 1:
+        return None
+    kind = types.pop() if types else pa.null()
+    return pa.chunked_array([c.cast(kind) for c in chunks], type=kind)
+
+def _fetch(sql: str, params=(), conn=None):
+    # Straight through the cursor: sqlite3 keeps the prepared statement in its
+    # per-connection cache (keyed by SQL text), and "?" parameters keep the
+    # SQL text, and so the cached statement, identical across values.
+    # Rows are pulled FETCH_BATCH_ROWS at a time and converted to typed Arrow
+    # arrays per batch, so only one batch of Python row tuples is alive at once.
+    cur = (conn or get_connection()).execute(sql, params)
+    cur.arraysize = FETCH_BATCH_ROWS
+    columns = [d[0] for d in cur.description]
+    chunks = [[] for _ in columns]
+    rows = []
+    try:
+        while rows := cur.fetchmany():
+            batch = [pa.array(values) for values in zip(*rows)]
+            for col, arr in zip(chunks, batch):
+                col.append(arr)
+        arrays = [_unify(col) for col in chunks]
+        if chunks and chunks[0] and all(a is not None for a in arrays):
+            return pa.table(arrays, names=columns)
+        rows = []
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    # Mixed value types within a column (or no rows): build the frame row-wise
+    done = list(zip(*[[v for c in col for v in c.to_pylist()] for col in chunks]))
+    return pd.DataFrame.from_records(done + list(rows) + cur.fetchall(),
+                                     columns=columns, coerce_float=True)
+
+def fetch_df(sql: str, params=(), conn=None) -> pd.DataFrame:
+    result = _fetch(sql, params, conn)
+    return result.to_pandas() if isinstance(result, pa.Table) else result
+
+def read_columnar(sql: str):
+    # ConnectorX (optional) decodes the result set natively into column
+    # buffers; None means "not available", and the caller uses fetch_df.
+    # It can only open the file, so it is skipped while queries are served
+    # from the in-memory copy (its results could differ from that copy's).
+    # It has no bound parameters, so only literal SQL goes this way, and its
+    # SQLite type inference can reject expression columns -- fall back then too.
+    if cx is None or IN_MEMORY:
+        return None
+    _prepare_db_once()
+    try:
+        return cx.read_sql(f"sqlite://{os.path.abspath(DB_PATH)}", sql.strip().rstrip(";"))
+    except Exception:
+        return None
+
+def _cached(key: tuple, build) -> pd.DataFrame:
+    # Single flight: concurrent misses on one key wait for the first caller's
+    # build instead of each running it (Q1-Q3 and Q9-Q12 share base fetches)
+    with _cache_lock:
+        df = _RESULT_CACHE.get(key)
+        if df is not None:
+            _RESULT_CACHE.move_to_end(key)
+            return df.copy(deep=False)
+        lock = _inflight.setdefault(key, threading.Lock())
+    with lock:
+        try:
+            with _cache_lock:
+                df = _RESULT_CACHE.get(key)
+            if df is None:
+                df = build()
+            with _cache_lock:
+                _RESULT_CACHE[key] = df
+                _RESULT_CACHE.move_to_end(key)
+                while len(_RESULT_CACHE) > RESULT_CACHE_MAX:
+                    _RESULT_CACHE.popitem(last=False)
+        finally:
+            with _cache_lock:
+                if _inflight.get(key) is lock:
+                    del _inflight[key]
+    return df.copy(deep=False)
+
+def _cached_fetch(sql: str, params: tuple, digest: bytes = None) -> pd.DataFrame:
+    def build():
+        df = None if params else read_columnar(sql)
+        return fetch_df(sql, params) if df is None else df
+    return _cached((digest or sql_hash(sql), params), build)
+
 def run_query(query_dict: dict) -> pd.DataFrame:
-    conn = get_connection()
-    df = pd.read_sql_query(query_dict["sql"], conn)
-    conn.close()
-    return df
+    sql = query_dict["sql"]
+    params = tuple(query_dict.get("params", ()))
+    digest = query_dict.get("_hash") or sql_hash(sql)
+    post = query_dict.get("post")
+    if post is None:
+        return _cached_fetch(sql, params, digest)
+    # The finished frame is cached as well, under the post step too, so a
+    # repeat run skips the pandas work and not just the fetch
+    return _cached((digest, params, post), lambda: post(_cached_fetch(sql, params, digest)))
+
+# PLAN CHECK — every query, and the loans read behind Q10/Q11's lists, must
+# reach its rows through an index. A bare "SCAN <table>" step is a full table
+# scan; scans of subquery results are exempt.
+
+def query_plan(query_dict: dict, conn=None) -> list:
+    conn = conn or get_connection()
+    rows = conn.execute("EXPLAIN QUERY PLAN " + query_dict["sql"],
+                        tuple(query_dict.get("params", ()))).fetchall()
+    return [row[3] for row in rows]
+
+def unindexed_scans(query_dict: dict, conn=None) -> list:
+    plan = query_plan(query_dict, conn)
+    derived = {step.split()[1] for step in plan if step.startswith(("MATERIALIZE ", "CO-ROUTINE "))}
+    scans = []
+    for step in plan:
+        if not step.startswith("SCAN ") or "USING" in step:
+            continue
+        target = step.split()[1]
+        if not target.startswith("(") and target not in derived:
+            scans.append(step)
+    return scans
+
+def check_query_plans(conn=None) -> list:
+    failures = []
+    loan_lists = {"title": "Q10/Q11 loan lists", "sql": LOAN_LISTS_SQL}
+    for q in ALL_QUERIES + [loan_lists]:
+        scans = unindexed_scans(q, conn)
+        if scans:
+            failures.append((q["title"], scans))
+    return failures
+
+def run_query_polars(query_dict: dict):
+    # Polars frame for consumers that take one (Streamlit renders them as-is).
+    # Plain SQL queries hand the Arrow batches to Polars without a pandas
+    # round trip or the pandas result cache; "post" queries convert their
+    # pandas result.
+    if pl is None:
+        raise ImportError("run_query_polars needs the optional 'polars' package")
+    if "post" in query_dict:
+        return pl.from_pandas(run_query(query_dict))
+    result = _fetch(query_dict["sql"], tuple(query_dict.get("params", ())))
+    return pl.from_arrow(result) if isinstance(result, pa.Table) else pl.from_pandas(result)
 
 if __name__ == "__main__":
+    if "--check-plans" in sys.argv:
+        failures = check_query_plans()
+        for title, scans in failures:
+            print(f"  ❌ {title}: {'; '.join(scans)}")
+        if not failures:
+            print(f"  ✅ All {len(ALL_QUERIES)} queries use indexes")
+        sys.exit(1 if failures else 0)
+
     print("=" * 60)
     print("  BankSight — Running All 15 Analytical Queries")
     print("=" * 60)
 
-    conn = get_connection()
     errors = []
 
-    for q in ALL_QUERIES:
+    # Queries run concurrently (SQLite releases the GIL; each worker thread has
+    # its own connection); results are printed in registry order
+    with ThreadPoolExecutor(max_workers=min(8, len(ALL_QUERIES))) as ex:
+        futures = [ex.submit(run_query, q) for q in ALL_QUERIES]
+
+    for q, future in zip(ALL_QUERIES, futures):
         print(f"\n{'─' * 60}")
         print(f"  {q['title']}")
         print(f"  {q['description']}")
         print(f"{'─' * 60}")
         try:
-            df = pd.read_sql_query(q["sql"], conn)
+            df = future.result()
             if df.empty:
                 print("  ⚠️  No results returned.")
             else:
-                print(df.to_string(index=False))
+                # Aligned table for short results; larger ones go out through
+                # the C CSV writer as tab-separated text
+                if len(df) < PRETTY_MAX_ROWS:
+                    print(df.to_string(index=False))
+                else:
+                    sys.stdout.flush()
+                    df.to_csv(sys.stdout, sep="\t", index=False, float_format="%.2f")
                 print(f"\n  ✅ {len(df)} row(s) returned")
         except Exception as e:
             print(f"  ❌ ERROR: {e}")
             errors.append((q["title"], str(e)))
 
-    conn.close()
-
     print("\n" + "=" * 60)
     if errors:
         print(f"  ⚠️  {len(errors)} query/queries had errors:")
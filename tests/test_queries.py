@@ -0,0 +1,77 @@
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+import queries  # noqa: E402
+
+DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database", "banksight.db")
+
+
+class RunQueryCacheTest(unittest.TestCase):
+    def setUp(self):
+        queries._RESULT_CACHE.clear()
+        self.fetches = self.posts = 0
+        self._fetch_df = queries.fetch_df
+        self._read_columnar = queries.read_columnar
+
+        def fetch_df(sql, params=(), conn=None):
+            self.fetches += 1
+            return pd.DataFrame({"x": [1.0, 2.0]})
+        queries.fetch_df = fetch_df
+        queries.read_columnar = lambda sql: None
+
+    def tearDown(self):
+        queries.fetch_df = self._fetch_df
+        queries.read_columnar = self._read_columnar
+        queries._RESULT_CACHE.clear()
+
+    def test_post_result_is_cached(self):
+        def post(df):
+            self.posts += 1
+            return df.assign(y=df["x"] * 2)
+        query = {"sql": "SELECT x FROM t", "post": post}
+        first = queries.run_query(query)
+        second = queries.run_query(query)
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual((self.fetches, self.posts), (1, 1))
+
+    def test_concurrent_misses_fetch_once(self):
+        started = threading.Event()
+        fetch_df = queries.fetch_df
+
+        def slow_fetch_df(sql, params=(), conn=None):
+            started.wait(1)
+            return fetch_df(sql, params, conn)
+        queries.fetch_df = slow_fetch_df
+        queries_ = [{"sql": "SELECT x FROM t", "post": lambda df, i=i: df.assign(i=i)} for i in range(8)]
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            futures = [ex.submit(queries.run_query, q) for q in queries_]
+            started.set()
+            [f.result() for f in futures]
+        self.assertEqual(self.fetches, 1)
+
+
+@unittest.skipUnless(os.path.exists(DB_PATH), "database/banksight.db has not been built")
+class QueryPlanTest(unittest.TestCase):
+    def test_all_queries_use_indexes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "banksight.db")
+            shutil.copyfile(DB_PATH, path)
+            conn = sqlite3.connect(path)
+            try:
+                queries.ensure_indexes(conn)
+                self.assertEqual(queries.check_query_plans(conn), [])
+            finally:
+                conn.close()
+
+
+if __name__ == "__main__":
+    unittest.main()